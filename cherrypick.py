@@ -0,0 +1,306 @@
+import os
+import sys
+import shutil
+import fnmatch
+import hashlib
+import filecmp
+import tempfile
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+CONFIG_FILE = ".merge_wizard.conf"
+CONFIG_KEYS = ("BASE_SRC", "INCOMING_SRC", "OUT_DIR", "SCOPE")
+# fora do .merge_wizard_tmp, que o merge.py oferece apagar ao final
+CACHE_ROOT = os.path.join(
+    os.environ.get(
+        "GITWIZARD_CACHE",
+        os.path.join(os.path.expanduser("~"), ".cache", "gitwizard")
+    ),
+    "sources"
+)
+
+# ==========================================================
+# Config (.merge_wizard.conf, formato KEY="valor")
+# ==========================================================
+
+def load_config():
+    conf = {}
+    if not os.path.exists(CONFIG_FILE):
+        return conf
+    with open(CONFIG_FILE, encoding="utf-8") as f:
+        for line in f:
+            key, sep, value = line.strip().partition("=")
+            if sep and not key.startswith("#"):
+                conf[key.strip()] = value.strip().strip('"')
+    return conf
+
+def save_config(conf):
+    with open(CONFIG_FILE, "w", encoding="utf-8") as f:
+        for key, value in conf.items():
+            f.write(f'{key}="{value}"\n')
+
+def ask(prompt, default=""):
+    if default:
+        value = input(f"{prompt} [{default}]: ").strip()
+        return value or default
+    return input(f"{prompt}: ").strip()
+
+# ==========================================================
+# Escopo (pathspecs)
+# ==========================================================
+
+def parse_scope(text):
+    specs = [s.strip().strip("/") for s in text.replace(" ", ",").split(",")]
+    return [s for s in specs if s and s != "."]
+
+def is_glob(spec):
+    return any(c in spec for c in "*?[")
+
+def in_scope(rel, scope):
+    if not scope:
+        return True
+    rel = rel.replace(os.sep, "/")
+    for spec in scope:
+        if rel == spec or rel.startswith(spec + "/") or fnmatch.fnmatch(rel, spec):
+            return True
+    return False
+
+def walk_scope(root, scope):
+    # pathspecs simples viram raízes do os.walk; com glob anda a árvore toda e filtra
+    if not scope or any(is_glob(s) for s in scope):
+        starts = [root]
+    else:
+        starts = [
+            os.path.join(root, s) for s in sorted(scope)
+            if not any(s.startswith(o + "/") for o in scope)
+        ]
+
+    for start in starts:
+        if os.path.isfile(start):
+            yield os.path.dirname(start), [], [os.path.basename(start)]
+            continue
+        for dirpath, dirs, files in os.walk(start):
+            dirs[:] = [d for d in dirs if d != ".git"]
+            if start == root and scope:
+                rel = os.path.relpath(dirpath, root)
+                files = [f for f in files if in_scope(os.path.normpath(os.path.join(rel, f)), scope)]
+            yield dirpath, dirs, files
+
+# o sparse-checkout ancora os padrões e seu "*" não cruza "/", ao contrário do
+# fnmatch do walk_scope; com glob o clone fica completo e o walk filtra
+def sparse_scope(scope):
+    return bool(scope) and not any(is_glob(s) for s in scope)
+
+def sparse_checkout(repo, scope):
+    if sparse_scope(scope):
+        patterns = ["/" + s for s in scope]
+        subprocess.check_call(["git", "sparse-checkout", "set", "--no-cone"] + patterns, cwd=repo)
+    else:
+        subprocess.check_call(["git", "sparse-checkout", "disable"], cwd=repo)
+
+# escopo comum a todas as ferramentas: SCOPE no .merge_wizard.conf
+def ask_scope():
+    conf = load_config()
+    current = conf.get("SCOPE", "")
+    text = input(
+        f"Escopo (pathspecs separados por vírgula, '-' = repo inteiro) [{current or 'tudo'}]: "
+    ).strip()
+    if text:
+        conf["SCOPE"] = "" if text == "-" else ",".join(parse_scope(text))
+        save_config(conf)
+    return parse_scope(conf.get("SCOPE", ""))
+
+# ==========================================================
+# Fontes (cache reutilizado entre execuções)
+# ==========================================================
+
+def is_git_url(src):
+    return src.startswith(("http://", "https://", "git@"))
+
+def prepare_source(src, scope=None):
+    if not is_git_url(src):
+        # caminho local é lido direto, sem cópia
+        if not os.path.isdir(src):
+            sys.exit(f"❌ Caminho inválido: {src}")
+        return os.path.abspath(src)
+
+    name = os.path.basename(src.rstrip("/")).replace(".git", "")
+    key = hashlib.sha1(src.encode()).hexdigest()[:10]
+    path = os.path.abspath(os.path.join(CACHE_ROOT, f"{name}-{key}"))
+
+    if os.path.isdir(os.path.join(path, ".git")):
+        print(f"♻️ Atualizando cache de {src}")
+        subprocess.check_call(["git", "fetch", "--quiet", "--prune", "origin"], cwd=path)
+        subprocess.check_call(["git", "reset", "--quiet", "--hard", "@{u}"], cwd=path)
+    else:
+        print(f"🌐 Clonando {src}")
+        os.makedirs(CACHE_ROOT, exist_ok=True)
+        if sparse_scope(scope):
+            subprocess.check_call(
+                ["git", "clone", "--quiet", "--filter=blob:none", "--sparse", src, path]
+            )
+        else:
+            subprocess.check_call(["git", "clone", "--quiet", src, path])
+    # o escopo pode mudar entre execuções: reaplica no clone em cache
+    sparse_checkout(path, scope)
+    return path
+
+# ==========================================================
+# Diff + apply
+# ==========================================================
+
+# uma passada pelo INCOMING: devolve (modificados, novos)
+def scan(base_dir, incoming_dir, scope=None):
+    modified, added = [], []
+    for root, _, files in walk_scope(incoming_dir, scope):
+        rel_root = os.path.relpath(root, incoming_dir)
+        for f in files:
+            rel = os.path.normpath(os.path.join(rel_root, f))
+            base_path = os.path.join(base_dir, rel)
+            if not os.path.isfile(base_path):
+                added.append(rel)
+            elif not filecmp.cmp(base_path, os.path.join(root, f), shallow=False):
+                modified.append(rel)
+    return modified, added
+
+def apply_one(workdir, base_dir, incoming_dir, out_dir, rel):
+    patch_path = os.path.join(out_dir, "patches_aplicados", rel + ".patch")
+    target = os.path.join(out_dir, rel)
+
+    # a/ e b/ apontam para BASE e INCOMING: o patch sai com caminhos relativos
+    diff = subprocess.run(
+        ["git", "diff", "--no-index", "--binary", "--no-prefix",
+         os.path.join("a", rel), os.path.join("b", rel)],
+        cwd=workdir, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    if diff.returncode not in (0, 1):
+        return rel, False, diff.stderr.decode(errors="replace")
+
+    os.makedirs(os.path.dirname(patch_path), exist_ok=True)
+    with open(patch_path, "wb") as f:
+        f.write(diff.stdout)
+
+    if not os.path.exists(target):
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copy2(os.path.join(base_dir, rel), target)
+
+    # sem o teto o git acha o repo que contém out_dir, lê os caminhos do patch
+    # a partir do topo dele e ignora em silêncio o que fica fora do cwd
+    env = dict(os.environ, GIT_CEILING_DIRECTORIES=os.path.dirname(out_dir))
+
+    # nova execução no mesmo OUT_DIR: patch que já aplica ao contrário já está lá
+    reverse = subprocess.run(
+        ["git", "apply", "--reverse", "--check", patch_path],
+        cwd=out_dir, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    if reverse.returncode == 0:
+        return rel, None, ""
+
+    with open(target, "rb") as f:
+        before = f.read()
+
+    applied = subprocess.run(
+        ["git", "apply", "--reject", patch_path],
+        cwd=out_dir, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    if applied.returncode == 0:
+        with open(target, "rb") as f:
+            if f.read() != before:
+                return rel, True, ""
+        return rel, False, f"{rel}: patch não alterou o arquivo\n"
+
+    rej_dir = os.path.join(out_dir, "rejeitados", os.path.dirname(rel))
+    os.makedirs(rej_dir, exist_ok=True)
+    if os.path.exists(target + ".rej"):
+        os.replace(target + ".rej", os.path.join(rej_dir, os.path.basename(rel) + ".rej"))
+    else:
+        # patch binário não tem .rej: guarda a versão do INCOMING
+        shutil.copy2(os.path.join(incoming_dir, rel), rej_dir)
+    return rel, False, applied.stderr.decode(errors="replace")
+
+def copy_new(incoming_dir, out_dir, rel):
+    dst = os.path.join(out_dir, "arquivos_novos", rel)
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    shutil.copy2(os.path.join(incoming_dir, rel), dst)
+
+def run_merge(base_dir, incoming_dir, out_dir, scope=None):
+    out_dir = os.path.abspath(out_dir)
+    for sub in ("patches_aplicados", "arquivos_novos", "rejeitados"):
+        os.makedirs(os.path.join(out_dir, sub), exist_ok=True)
+
+    print("🔍 Comparando árvores...")
+    modified, added = scan(base_dir, incoming_dir, scope)
+
+    workdir = tempfile.mkdtemp(prefix="merge_wizard_")
+    applied = skipped = rejected = 0
+    try:
+        os.symlink(base_dir, os.path.join(workdir, "a"), target_is_directory=True)
+        os.symlink(incoming_dir, os.path.join(workdir, "b"), target_is_directory=True)
+
+        print(f"🧩 Aplicando {len(modified)} patch(es) e {len(added)} arquivo(s) novo(s)...")
+        with ThreadPoolExecutor() as pool, \
+                open(os.path.join(out_dir, "merge.log"), "a", encoding="utf-8") as log:
+            copies = [pool.submit(copy_new, incoming_dir, out_dir, rel) for rel in added]
+
+            jobs = [
+                pool.submit(apply_one, workdir, base_dir, incoming_dir, out_dir, rel)
+                for rel in modified
+            ]
+            for job in as_completed(jobs):
+                rel, ok, err = job.result()
+                if err:
+                    log.write(err)
+                if ok:
+                    applied += 1
+                elif ok is None:
+                    skipped += 1
+                else:
+                    rejected += 1
+                    print(f"⚠️ Rejeitado: {rel}")
+            for job in copies:
+                job.result()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return applied, skipped, rejected, len(added)
+
+# ==========================================================
+# Main
+# ==========================================================
+
+def main():
+    print("🧙 MERGE CHERRYPICK WIZARD v2.0")
+    print("===================")
+
+    conf = load_config()
+
+    if ask("Manter configurações anteriores? (s/n)", "s") != "s":
+        for key in CONFIG_KEYS:
+            conf.pop(key, None)
+
+    conf["BASE_SRC"] = ask("BASE (path local ou URL git)", conf.get("BASE_SRC", ""))
+    conf["INCOMING_SRC"] = ask("INCOMING (path local ou URL git)", conf.get("INCOMING_SRC", ""))
+    conf["OUT_DIR"] = ask("Diretório de saída", conf.get("OUT_DIR") or "merge_output")
+
+    save_config(conf)
+    scope = ask_scope()
+
+    print("📥 Preparando BASE...")
+    base_dir = prepare_source(conf["BASE_SRC"], scope)
+
+    print("📥 Preparando INCOMING...")
+    incoming_dir = prepare_source(conf["INCOMING_SRC"], scope)
+
+    applied, skipped, rejected, added = run_merge(
+        base_dir, incoming_dir, conf["OUT_DIR"], scope
+    )
+
+    print(f"\n📊 Patches aplicados: {applied}")
+    print(f"📊 Patches já aplicados: {skipped}")
+    print(f"📊 Patches rejeitados: {rejected}")
+    print(f"📊 Arquivos novos: {added}")
+    print("✅ MERGE FINALIZADO")
+    print("📁 Resultado em:", os.path.abspath(conf["OUT_DIR"]))
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,51 @@
 #!/usr/bin/env python3
 
 import os
+import re
+import glob
+import json
+import hashlib
 import subprocess
 import sys
+import tempfile
+import threading
+import time
 from datetime import datetime
+from multiprocessing.connection import Client, Listener
+import urllib.error
 import urllib.request
 import shutil
 
+VERSION = "1.1"
+
 TMP_REMOTE = "__wizard_tmp__"
-WIZARD_REPO = "https://raw.githubusercontent.com/wrxxnch/gitwizard/main/gitwizard.py"
+BACKUP_NS = "refs/wizard/backups"
+BACKUP_KEEP = 10          # backups mantidos por branch (git config wizard.backupKeep)
+BACKUP_MAX_AGE_DAYS = 30  # idade máxima em dias (git config wizard.backupMaxAgeDays)
+WIZARD_REPO = os.environ.get(
+    "GITWIZARD_UPDATE_URL",
+    "https://raw.githubusercontent.com/wrxxnch/gitwizard/main/gitwizard.py"
+)
+CACHE_DIR = os.environ.get(
+    "GITWIZARD_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "gitwizard")
+)
+UPDATE_BACKUPS_KEEP = 3
+# escopo comum com merge.py / oldmerge.py / cherrypick.py (chave SCOPE); o
+# gitwizard se auto-atualiza como arquivo único, por isso lê o arquivo direto
+SCOPE_CONFIG = ".merge_wizard.conf"
+DAEMON_IDLE_TIMEOUT = 900  # segundos sem clientes até o daemon encerrar
+FETCH_TTL = 60             # fetch do mesmo remote dentro desse prazo é reaproveitado
+
+_daemon = None       # conexão com o daemon do repo ativo (None = git direto)
+_daemon_repo = None
+_COLD = object()     # resposta de daemon_call quando não há daemon
 
 # =========================================================
 # helpers
 # =========================================================
 
-def run(cmd, cwd=None, check=True):
+def run(cmd, cwd=None, check=True, quiet=False):
     result = subprocess.run(
         cmd,
         shell=True,
@@ -23,9 +54,9 @@ def run(cmd, cwd=None, check=True):
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE
     )
-    if result.stdout:
+    if result.stdout and not quiet:
         print(result.stdout)
-    if result.stderr:
+    if result.stderr and not quiet:
         print(result.stderr)
     if check and result.returncode != 0:
         raise RuntimeError("Erro ao executar comando")
@@ -35,18 +66,395 @@ def is_git_repo(path):
     return os.path.isdir(os.path.join(path, ".git"))
 
 def current_branch(repo):
+    value = daemon_call("branch")
+    if value is not _COLD:
+        return value
     return run("git branch --show-current", repo)
 
 def list_remotes(repo):
+    value = daemon_call("remotes")
+    if value is not _COLD:
+        return value
     out = run("git remote", repo)
     return out.splitlines() if out else []
 
+def fetch_remote(repo, remote):
+    # o fetch roda sempre aqui, no terminal do usuário (prompts de credencial);
+    # o daemon só lembra quando foi o último
+    # o remote temporário é recriado (talvez com outra URL) a cada comparação
+    if remote != TMP_REMOTE and daemon_call("fetch_fresh", remote) is True:
+        print(f"⚡ {remote} já atualizado há menos de {FETCH_TTL}s")
+        return
+    run(f"git fetch {remote}", repo)
+    daemon_call("fetched", remote)
+
+def resolve_ref(repo, ref):
+    value = daemon_call("resolve", ref)
+    if value is not _COLD:
+        return value
+    return run(f"git rev-parse --verify --quiet \"{ref}^{{commit}}\"", repo,
+               check=False, quiet=True) or None
+
+def git_config_int(repo, key, default):
+    out = run(f"git config --get {key}", repo, check=False, quiet=True)
+    try:
+        return int(out)
+    except ValueError:
+        return default
+
+def load_wizard_conf(repo):
+    conf = {}
+    try:
+        with open(os.path.join(repo, SCOPE_CONFIG), encoding="utf-8") as f:
+            for line in f:
+                key, sep, value = line.strip().partition("=")
+                if sep and not key.startswith("#"):
+                    conf[key.strip()] = value.strip().strip('"')
+    except OSError:
+        pass
+    return conf
+
+def save_wizard_conf(repo, conf):
+    with open(os.path.join(repo, SCOPE_CONFIG), "w", encoding="utf-8") as f:
+        for key, value in conf.items():
+            f.write(f'{key}="{value}"\n')
+
+def get_scope(repo):
+    return [s for s in load_wizard_conf(repo).get("SCOPE", "").split(",") if s]
+
+def scope_args(repo):
+    scope = get_scope(repo)
+    return (" -- " + " ".join(f'"{s}"' for s in scope)) if scope else ""
+
+# =========================================================
+# daemon (estado do repo mantido quente entre ações)
+# =========================================================
+
+def daemon_address(repo):
+    key = hashlib.sha1(os.path.realpath(repo).encode()).hexdigest()[:12]
+    if sys.platform == "win32":
+        return rf"\\.\pipe\gitwizard-{key}"
+    return os.path.join(tempfile.gettempdir(), f"gitwizard-{os.getuid()}-{key}.sock")
+
+def daemon_authkey(repo):
+    path = os.path.join(repo, ".git", "wizard.key")
+    if not os.path.exists(path):
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(os.urandom(32))
+    with open(path, "rb") as f:
+        return f.read()
+
+class RepoState:
+    def __init__(self, repo):
+        self.repo = repo
+        self.git_dir = os.path.join(repo, ".git")
+        self.lock = threading.Lock()
+        self.signature = None
+        self.cache = {}
+        self.fetched = {}
+        self.cat_file = subprocess.Popen(
+            ["git", "cat-file", "--batch-check"],
+            cwd=repo, text=True,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE
+        )
+
+    def git(self, *args):
+        return subprocess.run(
+            ["git", *args], cwd=self.repo, text=True,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+
+    def current_signature(self):
+        # qualquer escrita de ref troca o mtime do diretório (lock + rename)
+        paths = ["HEAD", "packed-refs", "config", "worktrees"]
+        sig = []
+        for p in paths:
+            try:
+                sig.append(os.stat(os.path.join(self.git_dir, p)).st_mtime_ns)
+            except OSError:
+                sig.append(None)
+        for root, _, _ in os.walk(os.path.join(self.git_dir, "refs")):
+            sig.append((root, os.stat(root).st_mtime_ns))
+        return sig
+
+    def cached(self, key, fn):
+        if key not in self.cache:
+            self.cache[key] = fn()
+        return self.cache[key]
+
+    def refs(self):
+        out = self.git("for-each-ref", "--format=%(refname)%09%(objectname)").stdout
+        return dict(line.split("\t") for line in out.splitlines())
+
+    def handle(self, op, args):
+        with self.lock:
+            sig = self.current_signature()
+            if sig != self.signature:
+                # config mudou: remotes podem ter sido removidos ou trocado de URL
+                if self.signature and sig[2] != self.signature[2]:
+                    self.fetched.clear()
+                self.cache.clear()
+                self.signature = sig
+
+            if op == "branch":
+                return self.cached("branch", lambda: self.git("branch", "--show-current").stdout.strip())
+            if op == "remotes":
+                return self.cached("remotes", lambda: self.git("remote").stdout.split())
+            if op == "worktrees":
+                return self.cached("worktrees", lambda: [
+                    line[len("worktree "):]
+                    for line in self.git("worktree", "list", "--porcelain").stdout.splitlines()
+                    if line.startswith("worktree ")
+                ])
+            if op == "remote_branches":
+                prefix = f"refs/remotes/{args[0]}/"
+                refs = self.cached("refs", self.refs)
+                return sorted(r[len(prefix):] for r in refs if r.startswith(prefix) and not r.endswith("/HEAD"))
+            if op == "resolve":
+                self.cat_file.stdin.write(f"{args[0]}^{{commit}}\n")
+                self.cat_file.stdin.flush()
+                sha, _, kind = self.cat_file.stdout.readline().partition(" ")
+                return sha if kind.startswith("commit") else None
+            if op == "fetch_fresh":
+                prefix = f"refs/remotes/{args[0]}/"
+                refs = self.cached("refs", self.refs)
+                return (time.time() - self.fetched.get(args[0], 0) < FETCH_TTL
+                        and any(r.startswith(prefix) for r in refs))
+            if op == "fetched":
+                self.fetched[args[0]] = time.time()
+                return None
+            raise RuntimeError(f"operação desconhecida: {op}")
+
+def serve_daemon(repo):
+    repo = os.path.realpath(repo)
+    address = daemon_address(repo)
+    if sys.platform != "win32" and os.path.exists(address):
+        # socket de um daemon que morreu sem limpar; se outro responde, não sobe de novo
+        if connect_daemon(repo, spawn=False):
+            return
+        os.remove(address)
+    state = RepoState(repo)
+    listener = Listener(address, authkey=daemon_authkey(repo))
+    last_seen = [time.time()]
+
+    # fechar o listener não acorda o accept() bloqueado: encerra o processo direto
+    def shutdown():
+        listener.close()
+        state.cat_file.terminate()
+        os._exit(0)
+
+    def watchdog():
+        while time.time() - last_seen[0] < DAEMON_IDLE_TIMEOUT:
+            time.sleep(5)
+        shutdown()
+
+    def client(conn):
+        with conn:
+            while True:
+                try:
+                    op, args = conn.recv()
+                except (EOFError, OSError):
+                    return
+                last_seen[0] = time.time()
+                if op == "stop":
+                    conn.send((True, None))
+                    shutdown()
+                try:
+                    conn.send((True, state.handle(op, args)))
+                except Exception as e:
+                    conn.send((False, str(e)))
+
+    threading.Thread(target=watchdog, daemon=True).start()
+    while True:
+        try:
+            conn = listener.accept()
+        except OSError:
+            # handshake falho de um cliente não derruba o daemon
+            continue
+        last_seen[0] = time.time()
+        threading.Thread(target=client, args=(conn,), daemon=True).start()
+
+def connect_daemon(repo, spawn=True):
+    address = daemon_address(repo)
+    authkey = daemon_authkey(repo)
+    try:
+        return Client(address, authkey=authkey)
+    except OSError:
+        if not spawn:
+            return None
+
+    kwargs = {}
+    if sys.platform == "win32":
+        kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.DETACHED_PROCESS
+    else:
+        kwargs["start_new_session"] = True
+    subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--daemon", os.path.realpath(repo)],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        **kwargs
+    )
+
+    for _ in range(40):
+        time.sleep(0.05)
+        try:
+            return Client(address, authkey=authkey)
+        except OSError:
+            pass
+    return None
+
+def daemon_call(op, *args):
+    global _daemon
+    if not _daemon:
+        return _COLD
+
+    try:
+        _daemon.send((op, args))
+        ok, value = _daemon.recv()
+    except (EOFError, OSError):
+        # daemon morreu: tenta subir outro uma vez, senão segue com git direto
+        _daemon = connect_daemon(_daemon_repo)
+        if not _daemon:
+            print("⚠️ Daemon indisponível, usando git direto")
+            return _COLD
+        try:
+            _daemon.send((op, args))
+            ok, value = _daemon.recv()
+        except (EOFError, OSError):
+            _daemon = None
+            print("⚠️ Daemon indisponível, usando git direto")
+            return _COLD
+
+    if not ok:
+        raise RuntimeError(value)
+    return value
+
+def stop_daemon(repo):
+    conn = connect_daemon(repo, spawn=False)
+    if not conn:
+        print("ℹ️ Daemon não está rodando")
+        return
+    with conn:
+        conn.send(("stop", ()))
+        conn.recv()
+    print("✔ Daemon encerrado")
+
+# =========================================================
+# backups (refs/wizard/backups/<branch>/<timestamp>)
+# =========================================================
+
+def backup_key(ts):
+    # "<YYYYmmdd_HHMMSS>[_n]" -> (timestamp, n); ordem por nome erra com _10 < _2
+    suffix = ts[16:]
+    return ts[:15], int(suffix) if suffix.isdigit() else 0
+
+def list_backups(repo, branch=None):
+    ns = f"{BACKUP_NS}/{branch}" if branch else BACKUP_NS
+    out = run(
+        f"git for-each-ref "
+        f"--format=\"%(refname)%09%(objectname:short)%09%(subject)\" {ns}/",
+        repo, quiet=True
+    )
+    backups = []
+    for line in out.splitlines():
+        ref, sha, subject = line.split("\t", 2)
+        name, _, ts = ref[len(BACKUP_NS) + 1:].rpartition("/")
+        if branch and name != branch:
+            continue
+        backups.append((ref, name, ts, sha, subject))
+    backups.sort(key=lambda b: backup_key(b[2]), reverse=True)
+    return backups
+
+def prune_backups(repo, branch, protect=None):
+    keep = git_config_int(repo, "wizard.backupKeep", BACKUP_KEEP)
+    max_age = git_config_int(repo, "wizard.backupMaxAgeDays", BACKUP_MAX_AGE_DAYS)
+    limit = datetime.now().timestamp() - max_age * 86400
+
+    doomed = []
+    for i, (ref, _, ts, _, _) in enumerate(list_backups(repo, branch)):
+        try:
+            created = datetime.strptime(ts[:15], "%Y%m%d_%H%M%S").timestamp()
+        except ValueError:
+            continue
+        # o backup mais recente (e o recém-criado) nunca é removido
+        if i > 0 and ref != protect and (i >= keep or created < limit):
+            doomed.append(ref)
+
+    if doomed:
+        # remoção em lote: uma única transação de refs
+        subprocess.run(
+            ["git", "update-ref", "--stdin"],
+            cwd=repo,
+            input="".join(f"delete {ref}\n" for ref in doomed),
+            text=True,
+            check=True,
+            stdout=subprocess.DEVNULL
+        )
+    run("git pack-refs --all", repo, quiet=True)
+    return len(doomed)
+
 def backup_branch(repo):
     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
     branch = current_branch(repo) or "detached"
-    name = f"backup/{branch}_{ts}"
-    run(f"git branch {name}", repo)
-    print(f"🛟 Backup criado: {name}")
+
+    # valor antigo vazio = só cria; no mesmo segundo ganha sufixo maior que os
+    # existentes, para continuar sendo o mais recente na ordenação
+    taken = [backup_key(b[2])[1] for b in list_backups(repo, branch) if b[2][:15] == ts]
+    start = max(taken) + 1 if taken else 0
+    for n in range(start, start + 100):
+        ref = f"{BACKUP_NS}/{branch}/{ts}" + (f"_{n}" if n else "")
+        result = subprocess.run(
+            ["git", "update-ref", "-m", "wizard backup", ref, "HEAD", ""],
+            cwd=repo, text=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        if result.returncode == 0:
+            break
+        if run(f"git rev-parse --verify --quiet {ref}", repo, check=False, quiet=True) == "":
+            print(result.stderr)
+            raise RuntimeError("Erro ao criar backup")
+    else:
+        raise RuntimeError("Erro ao criar backup")
+    print(f"🛟 Backup criado: {ref}")
+
+    pruned = prune_backups(repo, branch, protect=ref)
+    if pruned:
+        print(f"🧹 {pruned} backup(s) antigo(s) removido(s)")
+    return ref
+
+def migrate_legacy_backups(repo):
+    out = run(
+        "git for-each-ref --format=\"%(refname:short)%09%(objectname)\" refs/heads/backup/",
+        repo, quiet=True
+    )
+    lines = out.splitlines()
+    if not lines:
+        print("✔ Nenhum branch backup/* antigo encontrado")
+        return
+
+    cmds = []
+    branches = set()
+    for line in lines:
+        name, sha = line.split("\t")
+        branch, _, ts = name[len("backup/"):].rpartition("_")
+        branch, _, date = branch.rpartition("_")
+        if not branch or not (date + ts).isdigit():
+            continue
+        branches.add(branch)
+        cmds.append(f"create {BACKUP_NS}/{branch}/{date}_{ts} {sha}\n")
+        cmds.append(f"delete refs/heads/{name} {sha}\n")
+
+    subprocess.run(
+        ["git", "update-ref", "--stdin"],
+        cwd=repo,
+        input="".join(cmds),
+        text=True,
+        check=True,
+        stdout=subprocess.DEVNULL
+    )
+    print(f"📦 {len(cmds) // 2} branch(es) backup/* movidos para {BACKUP_NS}/")
+
+    for branch in branches:
+        prune_backups(repo, branch)
 
 # =========================================================
 # repo comparado
@@ -77,16 +485,18 @@ def setup_compare_remote(repo):
             raise RuntimeError(f"remote '{src}' não existe")
         remote = src
 
-    run(f"git fetch {remote}", repo)
+    fetch_remote(repo, remote)
     return remote
 
 def list_remote_branches(repo, remote):
-    out = run("git branch -r", repo)
-    branches = []
-    for line in out.splitlines():
-        line = line.strip()
-        if line.startswith(f"{remote}/") and "->" not in line:
-            branches.append(line.replace(f"{remote}/", ""))
+    branches = daemon_call("remote_branches", remote)
+    if branches is _COLD:
+        out = run("git branch -r", repo)
+        branches = []
+        for line in out.splitlines():
+            line = line.strip()
+            if line.startswith(f"{remote}/") and "->" not in line:
+                branches.append(line.replace(f"{remote}/", ""))
     if not branches:
         raise RuntimeError("nenhum branch remoto encontrado")
     return branches
@@ -119,7 +529,7 @@ def diff_flow(repo):
     branch = select_branch(branches)
 
     ref = input("Ref local (ENTER = HEAD): ").strip() or "HEAD"
-    run(f"git diff {ref} {remote}/{branch}", repo)
+    run(f"git diff {ref} {remote}/{branch}{scope_args(repo)}", repo)
 
 def merge_flow(repo):
     remote = setup_compare_remote(repo)
@@ -146,12 +556,60 @@ def cherry_pick_flow(repo):
 
 def revert_flow(repo):
     commit = input("Commit para voltar: ").strip()
-    if not commit:
+    if not commit or not resolve_ref(repo, commit):
         raise RuntimeError("commit inválido")
 
+    backup_branch(repo)
     run(f"git reset --hard {commit}", repo)
     print("⏪ Revertido com sucesso")
 
+def backups_flow(repo):
+    legacy = run("git for-each-ref --count=1 refs/heads/backup/", repo, quiet=True)
+    if legacy and input("Há branches backup/* antigos. Migrar? [s/N]: ").lower().startswith("s"):
+        migrate_legacy_backups(repo)
+
+    backups = list_backups(repo)
+    if not backups:
+        print("ℹ️ Nenhum backup encontrado")
+        return
+
+    print("\n🛟 Backups:")
+    for i, (_, branch, ts, sha, subject) in enumerate(backups, 1):
+        print(f"{i}) {branch} @ {ts}  {sha}  {subject}")
+
+    choice = input("Restaurar qual? (número, ENTER = nenhum): ").strip()
+    if not choice:
+        return
+    if not choice.isdigit() or not 1 <= int(choice) <= len(backups):
+        raise RuntimeError("número inválido")
+
+    ref = backups[int(choice) - 1][0]
+    if not input(f"Resetar o branch atual para {ref}? [s/N]: ").lower().startswith("s"):
+        return
+
+    backup_branch(repo)
+    run(f"git reset --hard {ref}", repo)
+    print("⏪ Backup restaurado")
+
+def scope_flow(repo):
+    scope = get_scope(repo)
+    print("\n🎯 Escopo atual:", ", ".join(scope) if scope else "repo inteiro")
+
+    text = input("Pathspecs (vírgula; '-' = repo inteiro; ENTER = manter): ").strip()
+    if not text:
+        return
+    conf = load_wizard_conf(repo)
+    if text == "-":
+        conf["SCOPE"] = ""
+        save_wizard_conf(repo, conf)
+        print("✔ Escopo removido")
+        return
+
+    specs = [s.strip().strip("/") for s in text.replace(" ", ",").split(",")]
+    conf["SCOPE"] = ",".join(s for s in specs if s and s != ".")
+    save_wizard_conf(repo, conf)
+    print("✔ Escopo salvo:", conf["SCOPE"])
+
 def log_flow(repo):
     run("git --no-pager log --oneline --graph --decorate -20", repo)
 
@@ -159,25 +617,115 @@ def log_flow(repo):
 # auto-update
 # =========================================================
 
-def update_wizard():
-    script_path = os.path.abspath(__file__)
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+def load_manifest():
+    try:
+        with open(os.path.join(CACHE_DIR, "manifest.json")) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(manifest):
+    path = os.path.join(CACHE_DIR, "manifest.json")
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+def parse_version(code):
+    m = re.search(rb'^VERSION = "([^"]+)"', code, re.M)
+    return m.group(1).decode() if m else "?"
+
+def load_cached_download(manifest):
+    try:
+        with open(os.path.join(CACHE_DIR, "gitwizard.py"), "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    return data if sha256(data) == manifest.get("sha256") else None
+
+def fetch_update(manifest, cached):
+    req = urllib.request.Request(WIZARD_REPO)
+
+    # requisição condicional só quando temos no cache a versão que o servidor conhece
+    if manifest.get("url") == WIZARD_REPO and cached is not None:
+        if manifest.get("etag"):
+            req.add_header("If-None-Match", manifest["etag"])
+        if manifest.get("last_modified"):
+            req.add_header("If-Modified-Since", manifest["last_modified"])
+
+    try:
+        with urllib.request.urlopen(req, timeout=30) as r:
+            data = r.read()
+            headers = r.headers
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and cached is not None:
+            return cached, None
+        raise
+
+    length = headers.get("Content-Length")
+    if length is not None and int(length) != len(data):
+        raise RuntimeError("download incompleto")
+    compile(data, WIZARD_REPO, "exec")
+    return data, headers
+
+def install_script(script_path, new_code):
     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
     backup = f"{script_path}.bak_{ts}"
+    shutil.copy2(script_path, backup)
+    print(f"🛟 Backup criado: {backup}")
 
-    print("🔄 Atualizando Git Wizard...")
-    print("🌐 Fonte:", WIZARD_REPO)
-
+    # escreve ao lado do script e troca com rename atômico
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(script_path), suffix=".tmp")
     try:
-        with urllib.request.urlopen(WIZARD_REPO) as r:
-            new_code = r.read()
+        with os.fdopen(fd, "wb") as f:
+            f.write(new_code)
+            f.flush()
+            os.fsync(f.fileno())
+        shutil.copymode(script_path, tmp)
+        os.replace(tmp, script_path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+    for old in sorted(glob.glob(glob.escape(script_path) + ".bak_*"))[:-UPDATE_BACKUPS_KEEP]:
+        os.remove(old)
 
-        shutil.copy2(script_path, backup)
-        print(f"🛟 Backup criado: {backup}")
+def update_wizard():
+    script_path = os.path.abspath(__file__)
 
-        with open(script_path, "wb") as f:
-            f.write(new_code)
+    print("🔄 Atualizando Git Wizard...")
+    print("🌐 Fonte:", WIZARD_REPO)
 
-        print("✅ Atualização concluída!")
+    try:
+        with open(script_path, "rb") as f:
+            local_hash = sha256(f.read())
+
+        manifest = load_manifest()
+        new_code, headers = fetch_update(manifest, load_cached_download(manifest))
+
+        if headers is not None:
+            manifest = {
+                "url": WIZARD_REPO,
+                "etag": headers.get("ETag"),
+                "last_modified": headers.get("Last-Modified"),
+                "version": parse_version(new_code),
+                "sha256": sha256(new_code),
+            }
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(os.path.join(CACHE_DIR, "gitwizard.py"), "wb") as f:
+                f.write(new_code)
+            save_manifest(manifest)
+
+        if manifest["sha256"] == local_hash:
+            print(f"✅ Já está na versão mais recente ({VERSION})")
+            return
+
+        install_script(script_path, new_code)
+
+        print(f"✅ Atualização concluída! {VERSION} → {manifest['version']}")
         print("♻️ Reinicie o script para usar a nova versão.")
 
     except Exception as e:
@@ -198,17 +746,38 @@ def menu():
 4) Reverter para commit
 5) Log resumido
 6) 🔄 Atualizar Git Wizard
+7) 🛟 Backups (listar / restaurar)
+8) 🎯 Escopo (pathspecs)
 0) Sair
 """)
 
 def main():
+    global _daemon, _daemon_repo
     repo = os.getcwd()
 
     if not is_git_repo(repo):
         sys.exit("❌ Execute dentro de um repositório git")
 
+    if "--stop-daemon" in sys.argv:
+        stop_daemon(repo)
+        return
+
+    # opcional: git config wizard.daemon true (ou --warm) mantém o estado quente
+    if "--warm" in sys.argv or run("git config --get wizard.daemon", repo,
+                                    check=False, quiet=True) == "true":
+        _daemon_repo = repo
+        _daemon = connect_daemon(repo)
+        if _daemon:
+            print("⚡ Daemon ativo")
+            worktrees = daemon_call("worktrees")
+            if worktrees is not _COLD and len(worktrees) > 1:
+                print("🌳 Worktrees:", ", ".join(worktrees))
+
     print("📦 Repo ativo:", repo)
     print("🌿 Branch:", current_branch(repo))
+    scope = get_scope(repo)
+    if scope:
+        print("🎯 Escopo:", ", ".join(scope))
 
     while True:
         menu()
@@ -227,6 +796,10 @@ def main():
                 log_flow(repo)
             elif c == "6":
                 update_wizard()
+            elif c == "7":
+                backups_flow(repo)
+            elif c == "8":
+                scope_flow(repo)
             elif c == "0":
                 break
             else:
@@ -235,4 +808,7 @@ def main():
             print("❌", e)
 
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) == 3 and sys.argv[1] == "--daemon":
+        serve_daemon(sys.argv[2])
+    else:
+        main()
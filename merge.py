@@ -4,9 +4,20 @@ import subprocess
 import sys
 import time
 import stat
+import json
+import fnmatch
 import difflib
+import filecmp
+
+from cherrypick import ask_scope, sparse_checkout, sparse_scope, walk_scope
 
 TMP_ROOT = ".merge_wizard_tmp"
+CACHE_DIR = os.environ.get(
+    "GITWIZARD_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "gitwizard")
+)
+CLASSIFY_CACHE = os.path.join(CACHE_DIR, "classify.json")
+SNIFF_BYTES = 8000          # mesmo bloco que o git usa para detectar binário
 
 # ==========================================================
 # Utils
@@ -50,6 +61,7 @@ def banner():
 * Saída: APENAS arquivos novos ou modificados
 * Diferença de linhas (diff) para código
 * Windows-safe filesystem
+* Escopo por pathspec (monorepo)
 """)
 
 def menu(title, options):
@@ -78,7 +90,7 @@ def confirm(msg):
 def run(cmd, cwd=None):
     subprocess.check_call(cmd, cwd=cwd)
 
-def clone_repo(url):
+def clone_repo(url, scope=None):
     os.makedirs(TMP_ROOT, exist_ok=True)
     name = os.path.basename(url).replace(".git", "")
     path = os.path.join(TMP_ROOT, name)
@@ -88,7 +100,12 @@ def clone_repo(url):
         safe_rmtree(path)
 
     print(f"🌐 Clonando {url}")
-    run(["git", "clone", url, path])
+    if sparse_scope(scope):
+        # clone parcial: só baixa blobs do escopo quando o checkout precisar
+        run(["git", "clone", "--filter=blob:none", "--sparse", url, path])
+        sparse_checkout(path, scope)
+    else:
+        run(["git", "clone", url, path])
     return os.path.abspath(path)
 
 def checkout(repo, ref):
@@ -130,13 +147,6 @@ def parse_pr_input(text):
 # File helpers
 # ==========================================================
 
-def read_file(path):
-    try:
-        with open(path, "r", encoding="utf-8", errors="ignore") as f:
-            return f.read()
-    except:
-        return ""
-
 def write_file(path, content):
     os.makedirs(os.path.dirname(path), exist_ok=True)
     with open(path, "w", encoding="utf-8") as f:
@@ -146,12 +156,11 @@ def write_file(path, content):
 # Merge logic
 # ==========================================================
 
-def is_binary_file(filename):
-    return os.path.splitext(filename)[1].lower() in {
-        ".png", ".jpg", ".jpeg", ".ogg", ".wav",
-        ".mp3", ".obj", ".mtl", ".blend",
-        ".dds", ".tga"
-    }
+BINARY_EXTENSIONS = {
+    ".png", ".jpg", ".jpeg", ".ogg", ".wav",
+    ".mp3", ".obj", ".mtl", ".blend",
+    ".dds", ".tga"
+}
 
 def is_code_file(filename):
     code_extensions = {
@@ -160,6 +169,125 @@ def is_code_file(filename):
     }
     return os.path.splitext(filename)[1].lower() in code_extensions
 
+# ==========================================================
+# Classificação binário / texto
+# ==========================================================
+
+# tabela persistida entre execuções:
+#   "path": {"/abs/arquivo": [tamanho, mtime_ns, "binary" | encoding]}
+# só os caminhos vistos na execução atual são gravados de volta
+_decisions = {"path": {}}
+_seen_paths = {}
+
+def load_decisions():
+    global _decisions
+    _seen_paths.clear()
+    try:
+        with open(CLASSIFY_CACHE, encoding="utf-8") as f:
+            _decisions = {"path": json.load(f).get("path", {})}
+    except (OSError, ValueError):
+        _decisions = {"path": {}}
+
+def save_decisions():
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(CLASSIFY_CACHE + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"path": _seen_paths}, f)
+        os.replace(CLASSIFY_CACHE + ".tmp", CLASSIFY_CACHE)
+    except OSError:
+        pass
+
+def load_gitattributes(root):
+    rules = []
+    try:
+        with open(os.path.join(root, ".gitattributes"), encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return rules
+
+    for line in lines:
+        parts = line.split()
+        if not parts or parts[0].startswith("#"):
+            continue
+        pattern, attrs = parts[0], parts[1:]
+        if "binary" in attrs or "-diff" in attrs:
+            rules.append((pattern, "binary"))
+        elif "text" in attrs or "text=true" in attrs:
+            rules.append((pattern, "text"))
+        elif "text=auto" in attrs:
+            # text=auto deixa o git detectar: anula regras anteriores, sem forçar nada
+            rules.append((pattern, None))
+    return rules
+
+def match_gitattributes(rules, rel):
+    rel = rel.replace(os.sep, "/")
+    kind = None
+    # a última regra que casa vence, como no git
+    for pattern, value in rules:
+        if "/" in pattern.strip("/"):
+            hit = fnmatch.fnmatch(rel, pattern.lstrip("/"))
+        else:
+            hit = fnmatch.fnmatch(os.path.basename(rel), pattern.lstrip("/"))
+        if hit:
+            kind = value
+    return kind
+
+def sniff(data):
+    head = data[:SNIFF_BYTES]
+    if head.startswith((b"\xff\xfe", b"\xfe\xff")):
+        return "utf-16"
+    if b"\0" in head:
+        return "binary"
+    try:
+        data.decode("utf-8")
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+    # sem NUL e não-UTF-8: texto legado se quase tudo for imprimível
+    printable = sum(1 for b in head if b >= 0x20 or b in b"\t\n\r\f\b")
+    return "latin-1" if printable >= len(head) * 0.95 else "binary"
+
+# retorna (tipo, texto); para "binary" o texto é None e nada é decodificado
+def classify(path, rel, rules):
+    ext = os.path.splitext(path)[1].lower()
+    forced = match_gitattributes(rules, rel)
+    if forced == "binary":
+        return "binary", None
+
+    # só .gitattributes e extensões sabidamente binárias dispensam a leitura
+    if forced is None and ext in BINARY_EXTENSIONS:
+        return "binary", None
+
+    key = os.path.abspath(path)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return "text", ""
+
+    # mesmo tamanho e mtime: decisão anterior vale sem reler o arquivo
+    cached = _seen_paths.get(key) or _decisions["path"].get(key)
+    kind = None
+    if cached and cached[:2] == [st.st_size, st.st_mtime_ns]:
+        kind = cached[2]
+        _seen_paths[key] = cached
+        if kind == "binary" and forced != "text":
+            return "binary", None
+
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return "text", ""
+
+    if kind is None:
+        kind = sniff(data)
+        _seen_paths[key] = [st.st_size, st.st_mtime_ns, kind]
+
+    if kind == "binary" and forced != "text":
+        return "binary", None
+    encoding = "utf-8" if kind == "binary" else kind
+    return "text", data.decode(encoding, errors="replace")
+
 def get_line_diff(old_txt, new_txt):
     diff = difflib.unified_diff(
         old_txt.splitlines(keepends=True),
@@ -170,10 +298,11 @@ def get_line_diff(old_txt, new_txt):
     )
     return "".join(diff)
 
-def apply_source(output, base_dir, source):
+def apply_source(output, base_dir, source, scope=None):
     copied = merged = 0
+    rules = load_gitattributes(source)
 
-    for root, _, files in os.walk(source):
+    for root, _, files in walk_scope(source, scope):
         if '.git' in root:
             continue
             
@@ -186,8 +315,6 @@ def apply_source(output, base_dir, source):
             base_path = os.path.join(base_dir, rel, f)
             dst_path = os.path.join(output, rel, f)
 
-            src_txt_raw = None # Cache para leitura se necessário
-
             # 1. NOVO: Arquivo não existe na base
             if not os.path.exists(base_path):
                 os.makedirs(os.path.dirname(dst_path), exist_ok=True)
@@ -196,19 +323,23 @@ def apply_source(output, base_dir, source):
                 print(f"[NOVO] {rel}/{f}")
                 continue
 
-            # 2. EXISTE: Comparar
-            if is_binary_file(f):
-                # Comparação binária simples por hash ou apenas copia se quiser sempre o novo
-                # Aqui vamos copiar se forem diferentes (usando stat para rapidez ou apenas copiar)
+            # 2. EXISTE: Comparar (cada arquivo é lido no máximo uma vez)
+            rel_file = os.path.normpath(os.path.join(rel, f))
+            src_kind, src_txt = classify(src_path, rel_file, rules)
+            base_kind = None
+            if src_kind != "binary":
+                base_kind, base_txt = classify(base_path, rel_file, rules)
+
+            if src_kind == "binary" or base_kind == "binary":
+                # Binário nunca passa pelo diff de texto: copia se o conteúdo mudou
+                if filecmp.cmp(src_path, base_path, shallow=False):
+                    continue
                 os.makedirs(os.path.dirname(dst_path), exist_ok=True)
                 shutil.copy2(src_path, dst_path)
                 merged += 1
                 print(f"[BINÁRIO ATUALIZADO] {rel}/{f}")
                 continue
 
-            base_txt = read_file(base_path)
-            src_txt = read_file(src_path)
-
             if base_txt == src_txt:
                 continue
 
@@ -240,7 +371,7 @@ def apply_source(output, base_dir, source):
 # Wizard
 # ==========================================================
 
-def get_sources(label):
+def get_sources(label, scope=None):
     print(f"\n📌 Selecionar {label}")
     opt = menu(
         f"Tipo de {label}",
@@ -258,7 +389,7 @@ def get_sources(label):
         return [("local", p)]
 
     repo_url = ask("URL do repositório git")
-    repo = clone_repo(repo_url)
+    repo = clone_repo(repo_url, scope)
 
     sources = []
 
@@ -285,7 +416,9 @@ def get_sources(label):
 def main():
     banner()
 
-    base_list = get_sources("BASE")
+    scope = ask_scope()
+
+    base_list = get_sources("BASE", scope)
     base_type, base_path = base_list[0]
 
     output = ask("\n📁 Pasta de SAÍDA (apenas alterados)")
@@ -299,13 +432,15 @@ def main():
     
     os.makedirs(output, exist_ok=True)
 
-    origin_sources = get_sources("ORIGEM")
+    origin_sources = get_sources("ORIGEM", scope)
 
+    load_decisions()
     total_copied = total_merged = 0
     for _, src in origin_sources:
-        c, m = apply_source(output, base_path, src)
+        c, m = apply_source(output, base_path, src, scope)
         total_copied += c
         total_merged += m
+    save_decisions()
 
     print("\n📊 RELATÓRIO FINAL (Apenas alterações)")
     print(f"Arquivos novos: {total_copied}")
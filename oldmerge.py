@@ -3,6 +3,8 @@ import shutil
 import subprocess
 import sys
 
+from cherrypick import ask_scope, sparse_checkout, sparse_scope, walk_scope
+
 TMP_ROOT = ".merge_wizard_tmp"
 
 # ---------------- UI ----------------
@@ -16,6 +18,7 @@ def banner():
 * Seleção de branch ou tag
 * Branch vs Branch
 * Merge seguro em pasta de teste
+* Escopo por pathspec (monorepo)
 """)
 
 def menu(title, options):
@@ -45,7 +48,7 @@ def run(cmd, cwd=None):
 def is_git_url(url):
     return url.startswith(("http://", "https://", "git@"))
 
-def clone_repo(url):
+def clone_repo(url, scope=None):
     os.makedirs(TMP_ROOT, exist_ok=True)
     name = os.path.basename(url).replace(".git", "")
     path = os.path.join(TMP_ROOT, name)
@@ -54,7 +57,11 @@ def clone_repo(url):
         shutil.rmtree(path)
 
     print(f"🌐 Clonando {url}")
-    subprocess.check_call(["git", "clone", url, path])
+    if sparse_scope(scope):
+        subprocess.check_call(["git", "clone", "--filter=blob:none", "--sparse", url, path])
+        sparse_checkout(path, scope)
+    else:
+        subprocess.check_call(["git", "clone", url, path])
     return os.path.abspath(path)
 
 def list_branches(repo):
@@ -88,13 +95,22 @@ def write_file(path, content):
     with open(path, "w", encoding="utf-8") as f:
         f.write(content)
 
-def merge(base, source, output):
+def merge(base, source, output, scope=None):
     print("\n📂 Copiando BASE → pasta de teste")
-    shutil.copytree(base, output)
+    if scope:
+        os.makedirs(output)
+        for root, _, files in walk_scope(base, scope):
+            rel = os.path.relpath(root, base)
+            for f in files:
+                dst = os.path.join(output, rel, f)
+                os.makedirs(os.path.dirname(dst), exist_ok=True)
+                shutil.copy2(os.path.join(root, f), dst)
+    else:
+        shutil.copytree(base, output)
 
     copied = merged = 0
 
-    for root, _, files in os.walk(source):
+    for root, _, files in walk_scope(source, scope):
         rel = os.path.relpath(root, source)
         dest_dir = os.path.join(output, rel) if rel != "." else output
 
@@ -152,7 +168,7 @@ def select_ref(repo):
     c = menu("Selecionar branch ou tag", options)
     return refs[c - 1]
 
-def get_source(label):
+def get_source(label, scope=None):
     print(f"\n📌 Selecionar {label}")
     opt = menu(
         f"Tipo de {label}",
@@ -171,7 +187,7 @@ def get_source(label):
         print("❌ URL inválida")
         sys.exit(1)
 
-    repo = clone_repo(url)
+    repo = clone_repo(url, scope)
     ref = select_ref(repo)
     checkout(repo, ref)
     return repo
@@ -179,6 +195,8 @@ def get_source(label):
 def main():
     banner()
 
+    scope = ask_scope()
+
     mode = menu(
         "Modo de operação",
         ["Merge normal", "Comparar branch vs branch (mesmo repo)"]
@@ -186,7 +204,7 @@ def main():
 
     if mode == 2:
         url = ask("URL do repositório")
-        repoA = clone_repo(url)
+        repoA = clone_repo(url, scope)
         repoB = repoA + "_cmp"
 
         shutil.copytree(repoA, repoB)
@@ -202,8 +220,8 @@ def main():
         base = repoA
         source = repoB
     else:
-        base = get_source("BASE")
-        source = get_source("ORIGEM")
+        base = get_source("BASE", scope)
+        source = get_source("ORIGEM", scope)
 
     output = ask("\n📁 Pasta de SAÍDA (teste)")
     if not output:
@@ -218,7 +236,7 @@ def main():
     if not confirm("\nConfirmar merge seguro?"):
         sys.exit(0)
 
-    merge(base, source, output)
+    merge(base, source, output, scope)
 
     print("\n✅ Merge finalizado")
     print("🧪 Teste em:", output)